@@ -1,11 +1,16 @@
 # coding: utf-8
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import ast
 import os
+import shutil
 import sys
 import tempfile
+import warnings
 
+import six
 from click.utils import safecall
+from pip._vendor.packaging.requirements import InvalidRequirement, Requirement
 
 from .. import click
 from .._compat import install_req_from_line, parse_requirements
@@ -33,6 +38,58 @@ install_command = create_install_command()
 pip_defaults = install_command.parser.get_default_values()
 
 
+def _static_install_requires(setup_file):
+    """
+    Returns the install_requires of a setup.py without executing it.
+
+    Only works when the file makes a single setup() call whose
+    install_requires is a literal list or tuple of requirement strings;
+    returns None otherwise, so the caller can fall back to running the
+    setup script. Requirements with environment markers are left out, as
+    they are from the install_requires that run_setup() reports.
+    """
+    try:
+        with open(setup_file, "rb") as f:
+            tree = ast.parse(f.read(), filename=setup_file)
+    except (SyntaxError, TypeError, ValueError):
+        return None
+
+    setup_calls = [
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and (
+            (isinstance(node.func, ast.Name) and node.func.id == "setup")
+            or (isinstance(node.func, ast.Attribute) and node.func.attr == "setup")
+        )
+    ]
+    if len(setup_calls) != 1:
+        return None
+
+    for keyword in setup_calls[0].keywords:
+        if keyword.arg != "install_requires":
+            continue
+        try:
+            install_requires = ast.literal_eval(keyword.value)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(install_requires, (list, tuple)) or not all(
+            isinstance(req, six.string_types) for req in install_requires
+        ):
+            return None
+        try:
+            reqs = [Requirement(req) for req in install_requires]
+        except InvalidRequirement:
+            return None
+        # setuptools moves requirements with markers out of install_requires
+        # (into extras_require), so run_setup() never returns them either.
+        return [
+            line for line, req in zip(install_requires, reqs) if req.marker is None
+        ]
+
+    return None
+
+
 @click.command()
 @click.version_option()
 @click.pass_context
@@ -314,6 +371,7 @@ def cli(
     ###
 
     constraints = []
+    primary_packages = set()
     for src_file in src_files:
         is_setup_file = os.path.basename(src_file) == "setup.py"
         if is_setup_file or src_file == "-":
@@ -322,46 +380,55 @@ def cli(
             # to a temporary file and have pip read that.  also used for
             # reading requirements from install_requires in setup.py.
             tmpfile = tempfile.NamedTemporaryFile(mode="wt", delete=False)
-            if is_setup_file:
-                from distutils.core import run_setup
-
-                dist = run_setup(src_file)
-                tmpfile.write("\n".join(dist.install_requires))
-            else:
-                tmpfile.write(sys.stdin.read())
-            tmpfile.flush()
-            constraints.extend(
-                parse_requirements(
-                    tmpfile.name,
-                    finder=repository.finder,
-                    session=repository.session,
-                    options=repository.options,
+            try:
+                if is_setup_file:
+                    install_requires = _static_install_requires(src_file)
+                    if install_requires is None:
+                        # distutils is deprecated on newer Pythons; importing it
+                        # should not add warnings to pip-compile's output.
+                        with warnings.catch_warnings():
+                            warnings.simplefilter("ignore", DeprecationWarning)
+                            from distutils.core import run_setup
+
+                        install_requires = run_setup(src_file).install_requires
+                    tmpfile.write("\n".join(install_requires))
+                else:
+                    shutil.copyfileobj(sys.stdin, tmpfile)
+                tmpfile.close()
+
+                ireqs = list(
+                    parse_requirements(
+                        tmpfile.name,
+                        finder=repository.finder,
+                        session=repository.session,
+                        options=repository.options,
+                    )
                 )
-            )
+            finally:
+                tmpfile.close()
+                os.unlink(tmpfile.name)
         else:
-            constraints.extend(
-                parse_requirements(
-                    src_file,
-                    finder=repository.finder,
-                    session=repository.session,
-                    options=repository.options,
-                )
+            ireqs = parse_requirements(
+                src_file,
+                finder=repository.finder,
+                session=repository.session,
+                options=repository.options,
             )
 
-    primary_packages = {
-        key_from_ireq(ireq) for ireq in constraints if not ireq.constraint
-    }
+        for ireq in ireqs:
+            if not ireq.constraint:
+                primary_packages.add(key_from_ireq(ireq))
+            # Filter out pip environment markers which do not match (PEP496)
+            if ireq.markers is None or ireq.markers.evaluate():
+                constraints.append(ireq)
 
     allowed_upgrades = primary_packages | existing_pins_to_upgrade
     constraints.extend(
-        ireq for key, ireq in upgrade_install_reqs.items() if key in allowed_upgrades
+        ireq
+        for key, ireq in upgrade_install_reqs.items()
+        if key in allowed_upgrades and (ireq.markers is None or ireq.markers.evaluate())
     )
 
-    # Filter out pip environment markers which do not match (PEP496)
-    constraints = [
-        req for req in constraints if req.markers is None or req.markers.evaluate()
-    ]
-
     log.debug("Using indexes:")
     for index_url in dedup(repository.finder.index_urls):
         log.debug("  {}".format(index_url))
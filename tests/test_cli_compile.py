@@ -1,6 +1,7 @@
 import os
 import subprocess
 import sys
+import tempfile
 from textwrap import dedent
 
 import mock
@@ -11,7 +12,7 @@ from .constants import MINIMAL_WHEELS_PATH, PACKAGES_PATH
 from .utils import invoke
 
 from piptools._compat.pip_compat import PIP_VERSION, path_to_url
-from piptools.scripts.compile import cli
+from piptools.scripts.compile import _static_install_requires, cli
 
 
 @pytest.fixture(autouse=True)
@@ -94,6 +95,103 @@ def test_command_line_setuptools_output_file(
     assert os.path.exists(expected_output_file)
 
 
+def test_command_line_setuptools_literal_install_requires(pip_conf, runner):
+    """
+    A literal install_requires is read without executing setup.py.
+    """
+    with open("setup.py", "w") as package:
+        package.write(
+            dedent(
+                """\
+                from setuptools import setup
+                raise RuntimeError("setup.py should not be executed")
+                setup(install_requires=["small-fake-a==0.1"])
+                """
+            )
+        )
+
+    out = runner.invoke(cli)
+
+    assert out.exit_code == 0, out.stderr
+    assert "small-fake-a==0.1" in out.stderr
+
+
+@pytest.mark.parametrize(
+    "install_requires",
+    (
+        pytest.param(
+            """["small-fake-a==0.1", "small-fake-b; python_version>='3'"]""",
+            id="literal",
+        ),
+        pytest.param(
+            """["small-fake-a==0.1"] + ["small-fake-b; python_version>='3'"]""",
+            id="dynamic",
+        ),
+    ),
+)
+def test_command_line_setuptools_install_requires_with_markers(
+    pip_conf, runner, install_requires
+):
+    """
+    Requirements with markers are left out of setup.py's install_requires
+    the same way, whether or not setup.py is executed.
+    """
+    with open("setup.py", "w") as package:
+        package.write(
+            dedent(
+                """\
+                from setuptools import setup
+                setup(install_requires={})
+                """
+            ).format(install_requires)
+        )
+
+    out = runner.invoke(cli)
+
+    assert out.exit_code == 0, out.stderr
+    assert "small-fake-a==0.1" in out.stderr
+    assert "small-fake-b" not in out.stderr
+
+
+def test_command_line_setuptools_dynamic_install_requires(pip_conf, runner):
+    """
+    A non-literal install_requires falls back to executing setup.py.
+    """
+    with open("setup.py", "w") as package:
+        package.write(
+            dedent(
+                """\
+                from setuptools import setup
+                install_requires = ["small-fake-" + name for name in "ab"]
+                setup(install_requires=install_requires)
+                """
+            )
+        )
+
+    out = runner.invoke(cli)
+
+    assert out.exit_code == 0, out.stderr
+    assert "small-fake-a==0.2" in out.stderr
+    assert "small-fake-b==0.3" in out.stderr
+
+
+@pytest.mark.parametrize(
+    "setup_py",
+    (
+        pytest.param(b"setup(install_requires={['a']})\n", id="unhashable literal"),
+        pytest.param(b"setup(install_requires=['a'])\n\x00", id="null byte"),
+    ),
+)
+def test_static_install_requires_falls_back(tmpdir, setup_py):
+    """
+    Sources that cannot be read statically return None instead of raising.
+    """
+    setup_file = tmpdir / "setup.py"
+    setup_file.write_binary(setup_py)
+
+    assert _static_install_requires(str(setup_file)) is None
+
+
 def test_find_links_option(runner):
     with open("requirements.in", "w") as req_in:
         req_in.write("-f ./libs3")
@@ -631,6 +729,64 @@ def test_stdin(pip_conf, runner):
     assert "small-fake-a==0.1" in out.stderr
 
 
+@pytest.fixture
+def tmp_requirements_files(monkeypatch):
+    """
+    Records the names of the temporary requirements files pip-compile creates.
+    """
+    names = []
+    named_temporary_file = tempfile.NamedTemporaryFile
+
+    def recording_named_temporary_file(*args, **kwargs):
+        tmpfile = named_temporary_file(*args, **kwargs)
+        names.append(tmpfile.name)
+        return tmpfile
+
+    # Only replace pip-compile's reference, pip creates temporary files too
+    monkeypatch.setattr(
+        "piptools.scripts.compile.tempfile",
+        mock.Mock(NamedTemporaryFile=recording_named_temporary_file),
+    )
+    return names
+
+
+def test_stdin_temporary_file_is_removed(pip_conf, runner, tmp_requirements_files):
+    """
+    The temporary file holding the STDIN requirements is removed after parsing.
+    """
+    out = runner.invoke(
+        cli, ["-", "--output-file", "requirements.txt", "-n"], input="small-fake-a==0.1"
+    )
+
+    assert out.exit_code == 0, out.stderr
+    assert len(tmp_requirements_files) == 1
+    assert not os.path.exists(tmp_requirements_files[0])
+
+
+def test_setup_py_temporary_file_is_removed_on_error(
+    pip_conf, runner, tmp_requirements_files
+):
+    """
+    The temporary file is removed even if executing setup.py fails.
+    """
+    with open("setup.py", "w") as package:
+        package.write(
+            dedent(
+                """\
+                from setuptools import setup
+                raise RuntimeError("broken setup.py")
+                setup(install_requires=["small-fake-" + name for name in "ab"])
+                """
+            )
+        )
+
+    out = runner.invoke(cli)
+
+    assert out.exit_code != 0
+    assert len(tmp_requirements_files) == 1
+    assert not os.path.exists(tmp_requirements_files[0])
+
+
 def test_multiple_input_files_without_output_file(runner):
     """
     The --output-file option is required for multiple requirement input files.